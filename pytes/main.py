@@ -4,6 +4,7 @@ Python Transcendental Equation Solvers.
 
 from functools import partial
 from copy import deepcopy
+import bisect
 import timeit
 import inspect
 import numpy as np
@@ -13,7 +14,8 @@ import mpmath as mp
 __all__ = ['grid_solver', 'find_sign_change', 'grid_find_sign_change', 'find_first_imag',
            'line_trace']
 
-def grid_solver(func, x_range, y_range, kwargs, method='sp.newton'):
+def grid_solver(func, x_range, y_range, kwargs, method='sp.newton', n_jobs=1,
+                fprime=None, fprime2=None, backend='numpy'):
     """
     Finds the roots of func in a box defined by x_range and y_range using an assigned method.
 
@@ -30,7 +32,31 @@ def grid_solver(func, x_range, y_range, kwargs, method='sp.newton'):
             These must be entered as {'key1':value1, 'key2':value2, etc.}
         method: string
             Specify which solver should be used to find the points.
-            Currently supported: sp.newton, sp.brentq.
+            Currently supported: sp.newton, sp.brentq, sp.brenth, sp.elementwise.find_root.
+            sp.elementwise.find_root requires func to accept numpy arrays for both the x-axis
+            and y-axis variables.
+        n_jobs: int
+            The number of processes used by sp.newton, sp.brentq and sp.brenth, which solve each
+            point on the x-axis independently. Any value other than 1 requires joblib.
+            -1 uses all the available cores.
+        fprime: function
+            The derivative of func with respect to the y-axis variable, with the same arguments
+            as func. Only used by sp.newton, which then uses Newton's method instead of the
+            secant method, roughly halving the number of evaluations of func.
+            For functions built with sympy, the derivative can be generated once using
+            sympy.lambdify(..., modules='numpy').
+        fprime2: function
+            The second derivative of func with respect to the y-axis variable. Only used by
+            sp.newton together with fprime, which then uses Halley's method.
+        backend: string
+            The array library used by sp.elementwise.find_root: numpy, cupy or torch.
+            With cupy or torch the grid is solved on the GPU, if one is available, and
+            SCIPY_ARRAY_API=1 must be set in the environment before scipy is imported.
+            func is called with arrays of that library, including when the roots found are
+            checked. With cupy, numpy functions such as np.tan dispatch to cupy. With torch,
+            func must use torch functions such as torch.tan, as numpy functions convert the
+            tensors to numpy arrays, which fails for tensors on the GPU.
+            Other methods only support numpy.
 
     Returns
     -------
@@ -41,28 +67,42 @@ def grid_solver(func, x_range, y_range, kwargs, method='sp.newton'):
     """
     start_time = timeit.default_timer()
 
-    points = []
     kwargs_copy = deepcopy(kwargs)
 
-    if method == 'sp.newton':
+    #Every method maps to a solver with the signature (func, x_range, y_range, kwargs).
+    solvers = {
+        'sp.newton': partial(_grid_solver_spnewton, n_jobs=n_jobs,
+                             fprime=fprime, fprime2=fprime2),
+        'sp.brentq': partial(_grid_solver_spbrent, n_jobs=n_jobs, brent=sp.brentq),
+        'sp.brenth': partial(_grid_solver_spbrent, n_jobs=n_jobs, brent=sp.brenth),
+        'sp.elementwise.find_root': partial(_grid_solver_spfindroot, backend=backend),
+        }
 
-        points = _grid_solver_spnewton(func, x_range, y_range, kwargs_copy)
+    if method not in solvers:
+        raise ValueError('Unknown method {}. Currently supported: {}.'
+                         .format(method, ', '.join(solvers)))
 
-    if method == 'sp.brentq':
+    if backend != 'numpy' and method != 'sp.elementwise.find_root':
+        raise ValueError('The {} backend is only supported by sp.elementwise.find_root.'
+                         .format(backend))
 
-        points = _grid_solver_spbrentq(func, x_range, y_range, kwargs_copy)
+    points = solvers[method](func, x_range, y_range, kwargs_copy)
 
     end_time = timeit.default_timer()
     running_time = end_time - start_time
 
+    #Both counts come from a single pass over the imaginary parts of the roots.
+    n_complex = int(np.count_nonzero(np.imag(points[:, 1]) != 0))
+    n_real = len(points) - n_complex
+
     print('\n' + '='*60 + '\n',
           '\nGrid solver finished running.\
           \nUsing the {} method, the total running time was {:.6f}s.\
           \nA total of {} real roots, and {} complex roots were found in the {}x{} grid.\n'
           .format(method,
                   running_time,
-                  np.count_nonzero(np.isreal(points[:, 1])),
-                  np.count_nonzero(np.isreal(points[:, 1]) is False),
+                  n_real,
+                  n_complex,
                   len(x_range), len(y_range)
                  ),
           '\n' + '='*60 + '\n'
@@ -70,7 +110,8 @@ def grid_solver(func, x_range, y_range, kwargs, method='sp.newton'):
 
     return points
 
-def _grid_solver_spnewton(func, x_range, y_range, kwargs, tol=1e-3):
+def _grid_solver_spnewton(func, x_range, y_range, kwargs, tol=1e-3, n_jobs=1,
+                          fprime=None, fprime2=None):
     """
     Finds the roots of func in a box defined by x_range and y_range using Newton's method as
     defined in scipy.optimize.
@@ -87,6 +128,12 @@ def _grid_solver_spnewton(func, x_range, y_range, kwargs, tol=1e-3):
             An array defining the y-axis.
         kwargs: dictionary
             Specify any other arguments of func as keys and their corresponding values.
+        n_jobs: int
+            The number of processes used to solve the x-axis slices.
+        fprime: function
+            The derivative of func with respect to the y-axis variable.
+        fprime2: function
+            The second derivative of func with respect to the y-axis variable.
 
     Returns
     -------
@@ -94,69 +141,83 @@ def _grid_solver_spnewton(func, x_range, y_range, kwargs, tol=1e-3):
             A nx2 numpy array, where n is the number of roots found.
     """
 
-    points = []
+    solve_slice = partial(_solve_slice_spnewton, fprime=fprime, fprime2=fprime2)
 
-    for x_loc in x_range:
+    return _grid_solver_slices(solve_slice, func, x_range, y_range, kwargs, tol, n_jobs)
 
-        #Creates a new dictionary corresponding to the x-axis.
-        #Creates a partial function using all the extra arguments.
-        #The partial function now only depends on the variable assigned to y-axis.
-        if 'x-axis' in kwargs:
-            x_axis = {}
-            var_name = kwargs['x-axis']
-            x_axis[var_name] = x_loc
-            del kwargs['x-axis']
-        else:
-            x_axis[var_name] = x_loc
+def _solve_slice_spnewton(func, x_loc, y_range, kwargs, fprime=None, fprime2=None):
+    """
+    Finds the roots of func along the line x = x_loc using Newton's method as defined in
+    scipy.optimize, starting from every point in y_range.
 
-        func_part = partial(func, **x_axis, **kwargs)
+    Used in _grid_solver_spnewton. Refer to that for more comments.
 
-        for y_loc in y_range:
-            try:
-                #Attempts to find a root of the function for the specified y_loc.
-                root = sp.newton(func_part, y_loc, tol=1e-20)
+    Parameters
+    ----------
+        func: function
+            A function of an arbitrary number of variables.
+        x_loc: float
+            The location on the x-axis.
+        y_range: array_like
+            An array defining the y-axis.
+        kwargs: dictionary
+            All the other arguments of func, including the x-axis variable.
+        fprime: function
+            The derivative of func with respect to the y-axis variable.
+        fprime2: function
+            The second derivative of func with respect to the y-axis variable.
 
-                #Verifies that the root found is within y_range.
-                #If it is within 1e-6 of any other root it is discarded.
-                #If the abs of the imaginary part is less than 1e-5 it is discarded.
-                if (root > y_range[0] and root < y_range[-1]) \
-                and not np.isclose(np.real(root), np.real(points), atol=1e-6).any():
+    Returns
+    -------
+        points: list
+            A list of [x_loc, root] pairs. These may contain duplicates.
+    """
 
-                    if np.imag(root) != 0 and np.abs(np.imag(root)) < 1e-10:
-                        root = np.real(root)
+    points = []
 
-                    points.append([x_loc, root])
+    #Creates a partial function using all the extra arguments.
+    #The partial function now only depends on the variable assigned to y-axis.
+    #The same is done for the derivatives, if given.
+    func_part = partial(func, **kwargs)
+    fprime_part = None if fprime is None else partial(fprime, **kwargs)
+    fprime2_part = None if fprime2 is None else partial(fprime2, **kwargs)
 
-                #If a root is not found, the method returns returns a RuntimeError.
-                #Pass to the next value of y_loc.
-            except (RuntimeError, ZeroDivisionError) as err:
-                if isinstance(err, RuntimeError):
-                    pass
-                if isinstance(err, ZeroDivisionError):
-                    print(err)
+    #The ends of y_range, used to verify that the roots found are within it.
+    y_lo = float(y_range[0])
+    y_hi = float(y_range[-1])
 
-    points = np.array(points)
+    for y_loc in y_range:
+        try:
+            #Attempts to find a root of the function for the specified y_loc.
+            root = sp.newton(func_part, y_loc, fprime=fprime_part, fprime2=fprime2_part,
+                             tol=1e-20)
 
-    argspec = inspect.getfullargspec(func)[0]
-    if 'self' in argspec:
-        argspec.remove('self')
+            #Verifies that the root found is within y_range.
+            #If the abs of the imaginary part is less than 1e-10 it is discarded.
+            if y_lo < root.real < y_hi:
 
-    kwargs[var_name] = points[:, 0]
-    kwargs[argspec[0]] = points[:, 1]
+                if root.imag != 0 and abs(root.imag) < 1e-10:
+                    root = root.real
 
-    vfunc = np.vectorize(func)
-    point_check = vfunc(**kwargs)
-    points = points[point_check < tol]
+                points.append([x_loc, root])
+
+            #If a root is not found, the method returns returns a RuntimeError.
+            #Pass to the next value of y_loc.
+        except (RuntimeError, ZeroDivisionError) as err:
+            if isinstance(err, RuntimeError):
+                pass
+            if isinstance(err, ZeroDivisionError):
+                print(err)
 
     return points
 
-def _grid_solver_spbrentq(func, x_range, y_range, kwargs, tol=1e-3):
+def _grid_solver_spbrent(func, x_range, y_range, kwargs, tol=1e-3, n_jobs=1, brent=sp.brentq):
     """
-    Finds the roots of func in a box defined by x_range and y_range using Brent's method as
-    defined in scipy.optimize.
+    Finds the roots of func in a box defined by x_range and y_range using one of Brent's methods
+    as defined in scipy.optimize.
 
     Much like the bisection method, Brent's method requires an interval in which the function
-    changes sign. We use find_sign_change to find changes in sign.
+    changes sign. We use _scan_and_brent to find changes in sign and solve for the roots.
 
     This method cannot find complex roots.
 
@@ -172,6 +233,10 @@ def _grid_solver_spbrentq(func, x_range, y_range, kwargs, tol=1e-3):
             An array defining the y-axis.
         kwargs: dictionary
             Specify any other arguments of func as keys and their corresponding values.
+        n_jobs: int
+            The number of processes used to solve the x-axis slices.
+        brent: function
+            Either sp.brentq or sp.brenth.
 
     Returns
     -------
@@ -179,78 +244,409 @@ def _grid_solver_spbrentq(func, x_range, y_range, kwargs, tol=1e-3):
             A nx2 numpy array, where n is the number of roots found.
     """
 
+    solve_slice = partial(_solve_slice_spbrent, brent=brent)
+
+    return _grid_solver_slices(solve_slice, func, x_range, y_range, kwargs, tol, n_jobs)
+
+def _solve_slice_spbrent(func, x_loc, y_range, kwargs, brent=sp.brentq):
+    """
+    Finds the roots of func along the line x = x_loc using one of Brent's methods as defined in
+    scipy.optimize, looking for changes in sign around every point in y_range.
+
+    Used in _grid_solver_spbrent. Refer to that for more comments.
+
+    Parameters
+    ----------
+        func: function
+            A function of an arbitrary number of variables.
+        x_loc: float
+            The location on the x-axis.
+        y_range: array_like
+            An array defining the y-axis.
+        kwargs: dictionary
+            All the other arguments of func, including the x-axis variable.
+        brent: function
+            Either sp.brentq or sp.brenth.
+
+    Returns
+    -------
+        points: list
+            A list of [x_loc, root] pairs. These may contain duplicates.
+    """
+
     points = []
 
     #Half the stepsize used in y_range.
     step_size = np.abs(y_range[0]-y_range[-1])/(2*len(y_range))
 
-    for x_loc in x_range:
+    #Creates a partial function using all the extra arguments.
+    #The partial function now only depends on the variable assigned to y-axis.
+    func_part = partial(func, **kwargs)
 
-        #Creates a new dictionary corresponding to the y-axis.
-        #Creates a partial function using all the extra arguments.
-        #The partial function now only depends on the variable assigned to y-axis.
-        if 'x-axis' in kwargs:
-            x_axis = {}
-            var_name = kwargs['x-axis']
-            x_axis[var_name] = x_loc
-            del kwargs['x-axis']
-        else:
-            x_axis[var_name] = x_loc
-        func_part = partial(func, **x_axis, **kwargs)
+    #The ends of y_range, used to verify that the roots found are within it.
+    y_lo = float(y_range[0])
+    y_hi = float(y_range[-1])
 
-        for y_loc in y_range:
+    #The fine grid around every y_loc is built from the same offsets, reusing one buffer.
+    y_offsets = np.linspace(-step_size, step_size, 10000)
+    y_range_local = np.empty_like(y_offsets)
 
-            #Refer to find_sign_change for comments.
-            y_range_local = np.linspace(y_loc-step_size, y_loc+step_size, 10000)
-            root_locs = find_sign_change(func_part, y_range_local)
+    for y_loc in y_range:
 
-            for i in np.where(root_locs)[0]:
+        np.add(y_offsets, y_loc, out=y_range_local)
 
-                #Assign the end-points of the interval used in sp.brentq.
-                brent_start = y_range_local[i-2]
-                brent_end = y_range_local[i+2]
+        for root in _scan_and_brent(func_part, y_range_local, brent):
 
-                try:
+            #Verifies that the root found is within y_range.
+            #If the imaginary part is less than 1e-10 it is discarded.
+            if y_lo < root.real < y_hi:
 
-                    #Attempts to find a root of the function between brent_start and brent_end.
-                    root = sp.brentq(func_part, brent_start, brent_end,
-                                     xtol=1e-5, rtol=1e-5, maxiter=200)
+                if root.imag != 0 and abs(root.imag) < 1e-10:
+                    root = root.real
 
-                    #Verifies that the root found is within y_range.
-                    #If it is within 1e-6 of any other root it is discarded.
-                    #If the imaginary part is less than 1e-5 it is discarded.
-                    if (root > y_range[0] and root < y_range[-1]) \
-                    and not np.isclose(np.real(root), np.real(points), atol=1e-6).any():
+                points.append([x_loc, root])
 
-                        if np.imag(root) != 0 and np.abs(np.imag(root)) < 1e-10:
-                            root = np.real(root)
+    return points
+
+def _scan_and_brent(func, interval, brent=sp.brentq, singularity_tol=1):
+    """
+    Finds the roots of func in an assigned interval using one of Brent's methods as defined in
+    scipy.optimize, starting from the points where func changes sign.
+
+    This combines find_sign_change with the calls to brent. The singularity check is only
+    carried out at the changes in sign, rather than on the whole interval.
+
+    Used in _solve_slice_spbrent.
 
-                        points.append([x_loc, root])
+    Parameters
+    ----------
+        func: function
+            A function of one variable, which accepts numpy arrays.
+        interval: array_like
+            A fine, sorted array in which to look for changes in sign.
+        brent: function
+            Either sp.brentq or sp.brenth.
+        singularity_tol: float
+            Refer to find_sign_change.
+
+    Returns
+    -------
+        roots: list
+            The roots found, one for every change in sign for which brent converged.
+    """
+
+    roots = []
+
+    #Refer to find_sign_change for comments.
+    func_evald = func(interval)
+    func_evald_real = np.asarray(func_evald).real
+    sign_change = np.flatnonzero(func_evald_real[:-1] * func_evald_real[1:] < 0)
+    sign_change = sign_change[np.abs(func_evald[sign_change]) < singularity_tol]
+
+    for i in sign_change:
+
+        #Assign the end-points of the interval used in brent.
+        brent_start = interval[max(i-2, 0)]
+        brent_end = interval[min(i+2, len(interval)-1)]
+
+        try:
+
+            #Attempts to find a root of the function between brent_start and brent_end.
+            roots.append(brent(func, brent_start, brent_end,
+                               xtol=1e-5, rtol=1e-5, maxiter=200))
+
+            #If a root is not found, the method returns returns either a
+            #RuntimeError or ValueError.
+            #Pass to the next change in sign.
+        except (RuntimeError, ValueError, ZeroDivisionError) as err:
+            if isinstance(err, (RuntimeError, ValueError)):
+                pass
+            if isinstance(err, ZeroDivisionError):
+                print(err)
+
+    return roots
+
+def _grid_solver_slices(solve_slice, func, x_range, y_range, kwargs, tol=1e-3, n_jobs=1):
+    """
+    Solves func along every line x = x_loc in x_range using solve_slice, then merges the roots.
 
-                    #If a root is not found, the method returns returns either a
-                    #RuntimeError or ValueError.
-                    #Pass to the next value of y_loc.
-                except (RuntimeError, ValueError, ZeroDivisionError) as err:
-                    if isinstance(err, (RuntimeError, ValueError)):
-                        pass
-                    if isinstance(err, ZeroDivisionError):
-                        print(err)
+    The slices are independent of each other, so for n_jobs other than 1 they are dispatched
+    to worker processes using joblib. Duplicate roots are only discarded once all the slices
+    are merged, so the result does not depend on n_jobs.
+
+    Used in _grid_solver_spnewton and _grid_solver_spbrent. Refer to those for more comments.
+
+    Parameters
+    ----------
+        solve_slice: function
+            One of _solve_slice_spnewton and _solve_slice_spbrent, or a partial of these.
+        func: function
+            A function of an arbitrary number of variables.
+        x_range: array_like
+            An array defining the x-axis.
+        y_range: array_like
+            An array defining the y-axis.
+        kwargs: dictionary
+            Specify any other arguments of func as keys and their corresponding values.
+        n_jobs: int
+            The number of processes used to solve the slices, as in joblib.Parallel.
+            -1 uses all the available cores.
+
+    Returns
+    -------
+        points: array_like
+            A nx2 numpy array, where n is the number of roots found.
+    """
+
+    var_name = kwargs['x-axis']
+    del kwargs['x-axis']
+
+    if n_jobs == 1:
+        #The slices are solved one after the other, so a single dictionary is reused and only
+        #the x-axis variable is updated for every point on the x-axis.
+        x_kwargs = {var_name: None, **kwargs}
+        slices = []
+        for x_loc in x_range:
+            x_kwargs[var_name] = x_loc
+            slices.append(solve_slice(func, x_loc, y_range, x_kwargs))
+    else:
+        #Every task is sent to a worker process with its own dictionary.
+        from joblib import Parallel, delayed
+        slices = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(solve_slice)(func, x_loc, y_range, {var_name: x_loc, **kwargs})
+            for x_loc in x_range)
+
+    #If a root is within 1e-6 of any other root it is discarded.
+    points = []
+    sorted_roots = []
+
+    for slice_points in slices:
+        for x_loc, root in slice_points:
+            if _insert_root(root, sorted_roots):
+                points.append([x_loc, root])
 
     points = np.array(points)
 
+    return _check_points(func, points, var_name, kwargs, tol)
+
+def _grid_solver_spfindroot(func, x_range, y_range, kwargs, tol=1e-3, backend='numpy',
+                            singularity_tol=1):
+    """
+    Finds the roots of func in a box defined by x_range and y_range using Chandrupatla's method
+    as defined in scipy.optimize.elementwise.find_root.
+
+    Every point in y_range is the centre of a bracket of width equal to the step of y_range.
+    All the brackets in the x_range by y_range grid are solved in a single vectorized call,
+    so func must accept numpy arrays for both the x-axis and the y-axis variables.
+
+    Like Brent's method, this method cannot find complex roots and finds at most one root
+    in each bracket.
+
+    Used in grid_solver. Refer to that for more comments.
+
+    Parameters
+    ----------
+        func: function
+            A function of an arbitrary number of variables.
+        x_range: array_like
+            An array defining the x-axis.
+        y_range: array_like
+            An array defining the y-axis.
+        kwargs: dictionary
+            Specify any other arguments of func as keys and their corresponding values.
+        backend: string
+            The array library in which the grid is solved: numpy, cupy or torch.
+        singularity_tol: float
+            Refer to find_sign_change.
+
+    Returns
+    -------
+        points: array_like
+            A nx2 numpy array, where n is the number of roots found.
+    """
+
+    from scipy.optimize import elementwise
+
+    to_backend, to_numpy = _array_backend(backend)
+
+    x_range = np.asarray(x_range, dtype=float)
+    y_range = np.asarray(y_range, dtype=float)
+
+    #Half the stepsize used in y_range.
+    step_size = np.abs(y_range[0]-y_range[-1])/(2*len(y_range))
+
+    var_name = kwargs['x-axis']
+    del kwargs['x-axis']
+
+    #The x-axis is broadcast along the rows and the brackets along the columns.
+    x_grid = x_range[:, None]
+    y_lower = to_backend(y_range[None, :] - step_size)
+    y_upper = to_backend(y_range[None, :] + step_size)
+
+    #The solver only sees the real part of func, as is the case in find_sign_change.
+    def func_part(y_loc, x_loc):
+        return np.real(func(y_loc, **{var_name: x_loc}, **kwargs))
+
+    res = elementwise.find_root(func_part, (y_lower, y_upper), args=(to_backend(x_grid),),
+                                tolerances=dict(xatol=1e-5, xrtol=1e-5), maxiter=200)
+
+    #The rest is done with numpy.
+    res_x = to_numpy(res.x)
+    res_f_x = to_numpy(res.f_x)
+    res_success = to_numpy(res.success)
+
+    #Brackets without a change in sign are flagged as unsuccessful and discarded.
+    #Verifies that the root found is within y_range.
+    #Changes in sign due to singularities converge onto the singularity, where the absolute
+    #value of func is large. Refer to find_sign_change for comments.
+    x_locs = np.broadcast_to(x_grid, res_x.shape)
+    found = res_success & (res_x > y_range[0]) & (res_x < y_range[-1]) \
+            & (np.abs(res_f_x) < singularity_tol)
+    x_locs = x_locs[found]
+    roots = res_x[found]
+
+    #The roots are taken in the same order as in the other methods, first along the x-axis
+    #and then along the y-axis.
+    #If a root is within 1e-6 of any other root it is discarded.
+    order = np.lexsort((roots, x_locs))
+    points = []
+    sorted_roots = []
+
+    for x_loc, root in zip(x_locs[order], roots[order]):
+        if _insert_root(root, sorted_roots):
+            points.append([x_loc, root])
+
+    points = np.array(points)
+
+    return _check_points(func, points, var_name, kwargs, tol, backend)
+
+def _array_backend(backend):
+    """
+    Returns the functions converting numpy arrays to the arrays of backend, and back.
+
+    Used in _grid_solver_spfindroot.
+
+    Parameters
+    ----------
+        backend: string
+            Either numpy, cupy or torch. Tensors are placed on the GPU if torch can use one.
+
+    Returns
+    -------
+        to_backend: function
+            Converts a numpy array to an array of backend.
+        to_numpy: function
+            Converts an array of backend to a numpy array.
+    """
+
+    if backend == 'numpy':
+        return np.asarray, np.asarray
+
+    if backend == 'cupy':
+        import cupy
+        return cupy.asarray, cupy.asnumpy
+
+    if backend == 'torch':
+        import torch
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        return partial(torch.asarray, device=device), lambda array: array.cpu().numpy()
+
+    raise ValueError('Unknown backend {}. Currently supported: numpy, cupy, torch.'
+                     .format(backend))
+
+def _check_points(func, points, var_name, kwargs, tol=1e-3, backend='numpy'):
+    """
+    Discards the points at which the value of func is not less than tol.
+
+    Used in grid_solver.
+
+    Parameters
+    ----------
+        func: function
+            A function of an arbitrary number of variables.
+        points: array_like
+            A nx2 numpy array of points on the x-axis and y-axis.
+        var_name: string
+            The argument of func corresponding to the x-axis.
+        kwargs: dictionary
+            Any other arguments of func as keys and their corresponding values.
+        tol: float
+            The tolerance on the value of func.
+        backend: string
+            With numpy, func is evaluated one point at a time. Otherwise func is evaluated on
+            arrays of backend, as in _grid_solver_spfindroot.
+
+    Returns
+    -------
+        points: array_like
+            The points which pass the check.
+    """
+
     argspec = inspect.getfullargspec(func)[0]
     if 'self' in argspec:
         argspec.remove('self')
 
-    kwargs[var_name] = points[:, 0]
-    kwargs[argspec[0]] = points[:, 1]
+    if backend == 'numpy':
+        kwargs[var_name] = points[:, 0]
+        kwargs[argspec[0]] = points[:, 1]
+
+        vfunc = np.vectorize(func)
+        point_check = vfunc(**kwargs)
+    else:
+        to_backend, to_numpy = _array_backend(backend)
+        kwargs[var_name] = to_backend(points[:, 0])
+        kwargs[argspec[0]] = to_backend(points[:, 1])
+
+        point_check = to_numpy(func(**kwargs))
 
-    vfunc = np.vectorize(func)
-    point_check = vfunc(**kwargs)
     points = points[point_check < tol]
 
     return points
 
+def _insert_root(root, sorted_roots, atol=1e-6, rtol=1e-5):
+    """
+    Checks whether root is a new root, and if so, inserts it into sorted_roots.
+
+    A root is new unless both its real and imaginary parts are within atol + rtol*abs(other)
+    of those of a root already found, as in np.isclose. Since sorted_roots is kept sorted by
+    the real part, only the roots with a close real part need to be compared, and these are
+    found using a binary search.
+
+    Used in grid_solver.
+
+    Parameters
+    ----------
+        root: float or complex
+            The candidate root.
+        sorted_roots: list
+            A sorted list of (real, imag) tuples of the roots found so far. Modified in place.
+        atol: float
+            The absolute tolerance.
+        rtol: float
+            The relative tolerance.
+
+    Returns
+    -------
+        is_new: bool
+            True if root was inserted into sorted_roots, False if it is a duplicate.
+    """
+
+    root_real = float(root.real)
+    root_imag = float(root.imag)
+
+    #Any root close to root_real lies within this window of the sorted real parts.
+    window = (atol + rtol * abs(root_real)) / (1 - rtol)
+    start = bisect.bisect_left(sorted_roots, (root_real - window, -np.inf))
+    end = bisect.bisect_right(sorted_roots, (root_real + window, np.inf))
+
+    for other_real, other_imag in sorted_roots[start:end]:
+        if abs(root_real - other_real) <= atol + rtol * abs(other_real) \
+        and abs(root_imag - other_imag) <= atol + rtol * abs(other_imag):
+            return False
+
+    bisect.insort(sorted_roots, (root_real, root_imag), start, end)
+    return True
+
 def find_sign_change(func, interval, singularity_tol=1):
     """
     Finds the points where the value of func changes sign in an assigned interval.
@@ -280,16 +676,14 @@ def find_sign_change(func, interval, singularity_tol=1):
     #Evaluate the function in the defined interval.
     func_evald = func(interval)
 
-    #Create two new arrays. One shifts func_evald up by one row and the other down by one row.
-    func_evald_shift_up = func_evald[1:]
-    func_evald_shift_down = func_evald[:-1]
-
-    #Multiply the real part of the arrays. Negative values correspond to sign changes.
-    func_evald_prod = np.real(func_evald_shift_down) * np.real(func_evald_shift_up)
+    #Multiply the real part of consecutive values. Negative values correspond to sign changes.
+    #The real part is taken with .real, which is a view rather than a copy.
+    func_evald_real = np.asarray(func_evald).real
+    func_evald_prod = func_evald_real[:-1] * func_evald_real[1:]
 
     #We add an extra condition that the absolute value of the point is less than a
     #chosen tolerance so as to avoid finding singularities.
-    return (func_evald_prod < 0) * (np.abs(func_evald[:-1]) < singularity_tol)
+    return (func_evald_prod < 0) & (np.abs(func_evald[:-1]) < singularity_tol)
 
 def grid_find_sign_change(func, x_range, y_range, kwargs):
     """
@@ -333,14 +727,15 @@ def grid_find_sign_change(func, x_range, y_range, kwargs):
 
     func_grid = func_part(y_grid, **x_axis)
 
-    grid_shift_up = func_grid[1:, :]
-    grid_shift_down = func_grid[:-1, :]
-    grid_prod = np.real(grid_shift_down) * np.real(grid_shift_up)
+    #Refer to find_sign_change for comments. The mask is computed once and used on both axes.
+    func_grid_real = np.asarray(func_grid).real
+    grid_prod = func_grid_real[:-1, :] * func_grid_real[1:, :]
+    sign_change = (grid_prod < 0) & (np.abs(func_grid[:-1, :]) < 1)
 
-    root_locs = x_grid[1:][(grid_prod < 0) * (np.abs(func_grid[:-1, :]) < 1)]
-    roots = y_grid[1:][(grid_prod < 0) * (np.abs(func_grid[:-1, :]) < 1)]
+    root_locs = x_grid[1:][sign_change]
+    roots = y_grid[1:][sign_change]
 
-    points = np.swapaxes(np.vstack((root_locs, roots)), 1, 0)
+    points = np.column_stack((root_locs, roots))
 
     end_time = timeit.default_timer()
     running_time = end_time - start_time
@@ -362,6 +757,10 @@ def find_first_imag(func, x_range, y_range, axes, kwargs, imag_tol=1e-5):
     """
     Similar to grid_solver, but stops once a complex solution is found.
 
+    The grid is first solved with a vectorized secant method, and the complex roots it finds are
+    confirmed with sp.newton. In rare cases, a point where the vectorized method finds a real root
+    but sp.newton would find a complex one is missed.
+
     Parameters
     ----------
         func: function
@@ -390,26 +789,190 @@ def find_first_imag(func, x_range, y_range, axes, kwargs, imag_tol=1e-5):
 
     kwargs_copy = deepcopy(kwargs)
 
-    for x_loc in x_range:
+    #The ends of y_range, used to verify that the roots found are within it.
+    y_lo = float(y_range[0])
+    y_hi = float(y_range[-1])
+
+    #All the points in the grid are first solved at once, with the x-axis as the outer loop.
+    #As the last digits of func differ between arrays and scalars, the vectorized secant method
+    #may fail where sp.newton converges, converge where sp.newton fails, or converge onto another
+    #root. The complex roots it finds and the points for which it failed are therefore solved
+    #again one at a time, in order, and only a complex root found by sp.newton is returned.
+    #The points for which it converged onto any other root are not solved again, so in rare
+    #cases the result may differ from solving every point with sp.newton.
+    #If func does not accept numpy arrays, all the points are solved one at a time.
+    x_grid, y_grid = np.meshgrid(x_range, y_range, indexing='ij')
+    x_grid = x_grid.ravel()
+    y_grid = y_grid.ravel()
+
+    def func_grid(y_loc, idx):
+        return func(y_loc, **{axes['x-axis']: x_grid[idx]}, **kwargs_copy)
+
+    try:
+        roots, found = _secant_vectorized(func_grid, y_grid, tol=1e-20)
+
+        hits = found & (roots.real > y_lo) & (roots.real < y_hi) & (np.abs(roots.imag) > imag_tol)
+
+        retry = np.flatnonzero(hits | ~found)
+
+    except (TypeError, ValueError):
+        retry = range(len(x_grid))
+
+    #A single function is used for all the points solved one at a time, which reads the x-axis
+    #variable from kwargs_copy when called.
+    def func_part(y_loc):
+        return func(y_loc, **kwargs_copy)
+
+    for idx in retry:
+
+        x_loc = x_grid[idx]
+        y_loc = y_grid[idx]
 
         kwargs_copy[axes['x-axis']] = x_loc
-        func_part = partial(func, **kwargs_copy)
 
-        for y_loc in y_range:
+        try:
+            root = sp.newton(func_part, y_loc, tol=1e-20)
+            if y_lo < root.real < y_hi and np.abs(np.imag(root)) > imag_tol:
+                return np.array([x_loc, root])
+
+        except RuntimeError:
+            pass
 
-            try:
-                root = sp.newton(func_part, y_loc, tol=1e-20)
-                if (root > y_range[0] and root < y_range[-1]) and np.abs(np.imag(root)) > imag_tol:
-                    return np.array([x_loc, root])
+def _secant_vectorized(func, y_init, tol=1.48e-8, maxiter=50):
+    """
+    Finds roots of func starting from every entry of y_init, using the secant method as
+    defined in sp.newton when no derivative is given.
 
-            except RuntimeError:
-                pass
+    Every entry follows the same steps and stopping criteria as a separate call to sp.newton,
+    but func is evaluated on all the entries which have not yet stopped at once.
+
+    Used in find_first_imag.
+
+    Parameters
+    ----------
+        func: function
+            A function func(y, idx), which evaluates the function at the points y of the
+            entries of y_init with indices idx.
+        y_init: array_like
+            A 1D array of real starting points.
+        tol: float
+            The tolerance on the change in the root between iterations.
+        maxiter: int
+            The maximum number of iterations.
+
+    Returns
+    -------
+        roots: array_like
+            A complex array with the root found for every entry of y_init.
+        found: array_like
+            A boolean array, False for the entries for which sp.newton would have raised
+            a RuntimeError.
+    """
+
+    y_init = np.asarray(y_init, dtype=float)
+
+    roots = np.zeros(len(y_init), dtype=complex)
+    found = np.zeros(len(y_init), dtype=bool)
+
+    #Starting points, as in sp.newton.
+    eps = 1e-4
+    p_1 = y_init * (1 + eps)
+    p_1 += np.where(p_1 >= 0, eps, -eps)
+    p_0 = y_init.astype(complex)
+    p_1 = p_1.astype(complex)
+
+    active = np.arange(len(y_init))
+    q_0 = np.asarray(func(p_0, active), dtype=complex)
+    q_1 = np.asarray(func(p_1, active), dtype=complex)
+
+    swap = np.abs(q_1) < np.abs(q_0)
+    p_0, p_1 = np.where(swap, p_1, p_0), np.where(swap, p_0, p_1)
+    q_0, q_1 = np.where(swap, q_1, q_0), np.where(swap, q_0, q_1)
+
+    with np.errstate(all='ignore'):
+        for _ in range(maxiter):
+
+            #A flat secant is only a root if both points coincide. Otherwise it is a failure.
+            flat = q_1 == q_0
+            roots[active[flat & (p_1 == p_0)]] = p_1[flat & (p_1 == p_0)]
+            found[active[flat & (p_1 == p_0)]] = True
+
+            active, p_0, p_1, q_0, q_1 = (arr[~flat] for arr in (active, p_0, p_1, q_0, q_1))
+
+            p_new = np.where(np.abs(q_1) > np.abs(q_0),
+                             (-q_0 / q_1 * p_1 + p_0) / (1 - q_0 / q_1),
+                             (-q_1 / q_0 * p_0 + p_1) / (1 - q_1 / q_0))
+
+            converged = np.abs(p_new - p_1) <= tol
+            roots[active[converged]] = p_new[converged]
+            found[active[converged]] = True
+
+            active, p_0, q_0, p_1 = (arr[~converged] for arr in (active, p_1, q_1, p_new))
+
+            if len(active) == 0:
+                break
+
+            q_1 = np.asarray(func(p_1, active), dtype=complex)
+
+    return roots, found
 
 def line_trace(func, x_loc, y_loc, step_size, x_end_left, x_end_right,
                kwargs=None, x_log=False, end_points=False,
-               func_mp=None, tol=1e-3):
+               func_mp=None, tol=1e-3, jit=False, fprime=None, fprime2=None):
     """
-    Docstring here.
+    Traces a line of roots of func, starting from a root near y_loc at x_loc and stepping
+    along the x-axis, first towards x_end_left and then towards x_end_right.
+
+    At every step, the next root is guessed by extrapolating from the previous roots. If no root
+    is found, the step is halved, down to step_size/64, before the trace in that direction is
+    aborted.
+
+    Parameters
+    ----------
+        func: function
+            A function of an arbitrary number of variables, whose first argument is the y-axis
+            variable.
+        x_loc: float
+            The location on the x-axis at which the trace starts.
+        y_loc: float or complex
+            The initial guess for the root at x_loc.
+        step_size: float
+            The step along the x-axis.
+        x_end_left: float
+            The left end of the trace on the x-axis.
+        x_end_right: float
+            The right end of the trace on the x-axis.
+        kwargs: dictionary
+            Specify any other arguments of func as keys and their corresponding values,
+            together with the x-axis variable as {'x-axis':'var1'}.
+        x_log: boolean
+            If True, the step is scaled by the order of magnitude of x_loc.
+        end_points: boolean
+            If False, the trace stops one step_size short of x_end_left and x_end_right.
+        func_mp: function
+            Currently not used.
+        tol: float
+            The tolerance on the value of func at every root found. A root which fails this
+            check is considered spurious and stops the trace in that direction.
+        jit: boolean
+            If True, the roots are found by a Newton's method compiled with numba, which
+            requires func, and fprime if given, to be compiled with numba.njit and to accept
+            complex values of the y-axis variable. Refer to _make_numba_newton.
+        fprime: function
+            The derivative of func with respect to the y-axis variable, with the same arguments
+            as func. sp.newton then uses Newton's method instead of the secant method.
+            If jit is True and fprime is not given, a forward difference is used instead.
+        fprime2: function
+            The second derivative of func with respect to the y-axis variable. Only used by
+            sp.newton together with fprime, which then uses Halley's method.
+            Ignored if jit is True.
+
+    Returns
+    -------
+        points: array_like
+            A nx2 numpy array, where n is the number of points found, sorted along the x-axis.
+            The entries in column 0 are points on the x-axis.
+            The entries in column 1 are points on the y-axis.
     """
 
     kwargs_copy = deepcopy(kwargs)
@@ -437,16 +1000,47 @@ def line_trace(func, x_loc, y_loc, step_size, x_end_left, x_end_right,
         x_end_left += step_init
         x_end_right -= step_init
 
-    func_part = partial(func, **x_axis, **kwargs_copy)
-    root = sp.newton(func_part, y_loc, maxiter=1000)
-    points = np.array([[x_loc, root]])
-
-    kwargs_check = deepcopy(kwargs_copy)
-
-    argspec = inspect.getfullargspec(func)[0]
+    argspec = inspect.getfullargspec(getattr(func, 'py_func', func))[0]
     if 'self' in argspec:
         argspec.remove('self')
 
+    #With jit, func must be compiled with numba.njit. The roots are then found by a compiled
+    #Newton's method, which takes the remaining arguments of func as a tuple instead of
+    #a partial function. Refer to _make_numba_newton for comments.
+    if jit is True:
+        newton = _make_numba_newton(func, fprime)
+    else:
+        newton = sp.newton
+
+    #The arguments of func are gathered once. At every step only the x-axis variable is updated,
+    #either in the dictionary used by partial or at its index in the tuple used with jit.
+    #fprime and fprime2 take the same arguments as func. With jit, fprime is compiled into
+    #newton and fprime2 is not used.
+    func_kwargs = {**x_axis, **kwargs_copy}
+    if jit is True:
+        func_args = [func_kwargs[arg] for arg in argspec[1:]]
+        x_index = argspec[1:].index(var_name)
+
+    def bind_func(x_loc):
+        if jit is True:
+            func_args[x_index] = x_loc
+            return tuple(func_args), None, None
+        func_kwargs[var_name] = x_loc
+        return tuple(None if f is None else partial(f, **func_kwargs)
+                     for f in (func, fprime, fprime2))
+
+    func_part, fprime_part, fprime2_part = bind_func(x_loc)
+    root = newton(func_part, y_loc, fprime=fprime_part, fprime2=fprime2_part, maxiter=1000)
+
+    #The points are stored in two preallocated arrays, one for each axis, of which only the
+    #first count entries are used. Refer to _append_point for comments.
+    n_max = int(np.abs(x_end_right - x_end_left) / step_init * 2) + 16
+    pts_x = np.zeros(n_max)
+    pts_y = np.zeros(n_max, dtype=complex)
+    pts_x, pts_y, count = _append_point(pts_x, pts_y, 0, x_loc, root)
+
+    kwargs_check = deepcopy(kwargs_copy)
+
     while np.real(x_loc) > x_end_left:
 
         x_loc_prev = x_loc
@@ -454,21 +1048,20 @@ def line_trace(func, x_loc, y_loc, step_size, x_end_left, x_end_right,
             step_size = step_init * 10**int(np.log10(x_loc_prev))
         x_loc -= step_size
 
-        x_axis[var_name] = x_loc
-
-        func_part = partial(func, **x_axis, **kwargs_copy)
+        func_part, fprime_part, fprime2_part = bind_func(x_loc)
 
         try:
-            next_points, step_size, x_error = _next_root(func_part, x_loc, x_loc_prev,
-                                                        y_loc, y_loc_prev, y_loc_pprev, -step_size)
+            root, step_size, x_error = _next_root(func_part, x_loc, x_loc_prev,
+                                                  y_loc, y_loc_prev, y_loc_pprev, -step_size,
+                                                  newton, fprime_part, fprime2_part)
 
-            kwargs_check[var_name] = next_points[0, 0]
-            kwargs_check[argspec[0]] = next_points[0, 1]
+            kwargs_check[var_name] = x_loc
+            kwargs_check[argspec[0]] = root
 
-            point_check = func(**kwargs_check)
+            point_check = np.asarray(func(**kwargs_check))
 
             if point_check < tol:
-                points = np.vstack([points, next_points])
+                pts_x, pts_y, count = _append_point(pts_x, pts_y, count, x_loc, root)
             else:
                 print('Spurious root found when solving for x = {:.5f}, y = {}.\n'
                       .format(x_loc, y_loc),
@@ -499,19 +1092,16 @@ def line_trace(func, x_loc, y_loc, step_size, x_end_left, x_end_right,
         else:
             pass
 
-        y_loc = points[-1, 1]
-        y_loc_prev = points[-2, 1]
+        y_loc = pts_y[count-1]
+        y_loc_prev = pts_y[count-2] if count >= 2 else None
+        y_loc_pprev = pts_y[count-3] if count >= 3 else None
 
-        try:
-            y_loc_pprev = points[-3, 1]
-        except IndexError:
-            y_loc_pprev = None
-
-    points = points[::-1]
-    x_loc = points[-1, 0]
-    y_loc = points[-1, 1]
-    y_loc_prev = points[-2, 1]
-    y_loc_pprev = points[-3, 1]
+    pts_x[:count] = pts_x[count-1::-1].copy()
+    pts_y[:count] = pts_y[count-1::-1].copy()
+    x_loc = pts_x[count-1]
+    y_loc = pts_y[count-1]
+    y_loc_prev = pts_y[count-2] if count >= 2 else None
+    y_loc_pprev = pts_y[count-3] if count >= 3 else None
 
     while np.real(x_loc) < x_end_right:
 
@@ -520,20 +1110,20 @@ def line_trace(func, x_loc, y_loc, step_size, x_end_left, x_end_right,
             step_size = step_init * 10**int(np.log10(x_loc_prev))
         x_loc += step_size
 
-        x_axis[var_name] = x_loc
-        func_part = partial(func, **x_axis, **kwargs_copy)
+        func_part, fprime_part, fprime2_part = bind_func(x_loc)
 
         try:
-            next_points, step_size, x_error = _next_root(func_part, x_loc, x_loc_prev,
-                                                        y_loc, y_loc_prev, y_loc_pprev, -step_size)
+            root, step_size, x_error = _next_root(func_part, x_loc, x_loc_prev,
+                                                  y_loc, y_loc_prev, y_loc_pprev, -step_size,
+                                                  newton, fprime_part, fprime2_part)
 
-            kwargs_check[var_name] = next_points[0, 0]
-            kwargs_check[argspec[0]] = next_points[0, 1]
+            kwargs_check[var_name] = x_loc
+            kwargs_check[argspec[0]] = root
 
-            point_check = func(**kwargs_check)
+            point_check = np.asarray(func(**kwargs_check))
 
             if point_check < tol:
-                points = np.vstack([points, next_points])
+                pts_x, pts_y, count = _append_point(pts_x, pts_y, count, x_loc, root)
             else:
                 print('Spurious root found when solving for x = {:.5f}, y = {}.\n'
                       .format(x_loc, y_loc),
@@ -552,7 +1142,7 @@ def line_trace(func, x_loc, y_loc, step_size, x_end_left, x_end_right,
                 print('Final error when solving for x = {:.5f}, y = {}.' \
                       '\nAborting forward line_trace.'
                       .format(x_loc, y_loc))
-                return points
+                return np.column_stack((pts_x[:count], pts_y[:count]))
 
         if x_error is None and x_error_loc is None:
             pass
@@ -564,19 +1154,55 @@ def line_trace(func, x_loc, y_loc, step_size, x_end_left, x_end_right,
         else:
             pass
 
-        y_loc = points[-1, 1]
-        y_loc_prev = points[-2, 1]
+        y_loc = pts_y[count-1]
+        y_loc_prev = pts_y[count-2] if count >= 2 else None
+        y_loc_pprev = pts_y[count-3] if count >= 3 else None
 
-        try:
-            y_loc_pprev = points[-3, 1]
-        except IndexError:
-            y_loc_pprev = None
+    pts_y = pts_y[:count]
+    pts_y.imag[np.abs(pts_y.imag) < 1e-10] = 0
+    return np.column_stack((pts_x[:count], pts_y))
 
-    points[:, 1][np.abs(np.imag(points[:, 1])) < 1e-10] = \
-    np.real(points[:, 1][np.abs(np.imag(points[:, 1])) < 1e-10])
-    return points
+def _append_point(pts_x, pts_y, count, x_loc, y_loc):
+    """
+    Stores a point at index count of the preallocated arrays pts_x and pts_y.
+    Both arrays are doubled in size if they are full.
+
+    Used in line_trace and _next_root_mp.
 
-def _next_root(func, x_loc, x_loc_prev, y_loc, y_loc_prev, y_loc_pprev, step_size):
+    Parameters
+    ----------
+        pts_x: array_like
+            The locations on the x-axis found so far, followed by unused entries.
+        pts_y: array_like
+            The locations on the y-axis found so far, followed by unused entries.
+        count: int
+            The number of points stored so far.
+        x_loc: float
+            The location on the x-axis of the new point.
+        y_loc: float or complex
+            The location on the y-axis of the new point.
+
+    Returns
+    -------
+        pts_x: array_like
+            The updated pts_x, which may be a new array.
+        pts_y: array_like
+            The updated pts_y, which may be a new array.
+        count: int
+            The number of points stored.
+    """
+
+    if count == len(pts_x):
+        pts_x = np.concatenate((pts_x, np.zeros_like(pts_x)))
+        pts_y = np.concatenate((pts_y, np.zeros_like(pts_y)))
+
+    pts_x[count] = x_loc
+    pts_y[count] = y_loc
+
+    return pts_x, pts_y, count + 1
+
+def _next_root(func, x_loc, x_loc_prev, y_loc, y_loc_prev, y_loc_pprev, step_size,
+               newton=sp.newton, fprime=None, fprime2=None):
     """
     Docstring here.
     """
@@ -587,33 +1213,90 @@ def _next_root(func, x_loc, x_loc_prev, y_loc, y_loc_prev, y_loc_pprev, step_siz
     try:
         grad = ((y_loc - y_loc_prev) + (y_loc - 2 * y_loc_prev + y_loc_pprev)) * \
                 np.abs(step_size/(x_loc - x_loc_prev))
-        root = sp.newton(func, y_loc + grad + 1e-20 * 1j, maxiter=iterations)
-        if np.abs(root - y_loc) < jump_limit:
-            next_points = np.array([[x_loc, root]])
-        else:
+        root = newton(func, y_loc + grad + 1e-20 * 1j, fprime=fprime, fprime2=fprime2,
+                      maxiter=iterations)
+        if np.abs(root - y_loc) >= jump_limit:
             raise ValueError('Jump of {:.5f} at x = {:.5f}, y = {:.5f}'.format(\
                              np.abs(root-y_loc), x_loc, y_loc+grad))
         x_error = None
 
     except TypeError:
         if (y_loc_prev is None) and (y_loc_pprev is None):
-            root = sp.newton(func, y_loc, maxiter=iterations)
-            next_points = np.array([[x_loc, root]])
+            root = newton(func, y_loc, fprime=fprime, fprime2=fprime2, maxiter=iterations)
         elif y_loc_pprev is None:
             grad = ((y_loc - y_loc_prev) * np.abs(step_size/(x_loc - x_loc_prev)))
-            root = sp.newton(func, y_loc + grad + 1e-20 * 1j, maxiter=iterations)
-            if np.abs(root - y_loc) < jump_limit:
-                next_points = np.array([[x_loc, root]])
-            else:
+            root = newton(func, y_loc + grad + 1e-20 * 1j, fprime=fprime, fprime2=fprime2,
+                          maxiter=iterations)
+            if np.abs(root - y_loc) >= jump_limit:
                 raise ValueError('Jump of {:.5f} at x = {:.5f}, y = {:.5f}'.format(\
                              np.abs(root-y_loc), x_loc, y_loc+grad))
 
         x_error = None
 
-    return next_points, np.abs(step_size), x_error
+    return root, np.abs(step_size), x_error
+
+def _make_numba_newton(func, fprime=None, tol=1.48e-8, step=1e-8):
+    """
+    Creates a Newton's method compiled with numba, specialised on func.
+
+    func must itself be compiled with numba.njit, take the y-axis variable as its first argument
+    and accept complex values, as the iteration is always carried out in complex128.
+    If fprime is not given, the derivative is approximated by a forward difference.
+
+    Used in line_trace when jit is True.
+
+    Parameters
+    ----------
+        func: function
+            A function of an arbitrary number of variables, compiled with numba.njit.
+        fprime: function
+            The derivative of func with respect to the y-axis variable, compiled with
+            numba.njit and with the same arguments as func.
+        tol: float
+            The iteration stops once the Newton step is smaller than tol.
+        step: float
+            The step used in the forward difference.
+
+    Returns
+    -------
+        newton: function
+            A function newton(arguments, x0, maxiter) where arguments is a tuple with all the
+            other arguments of func, in order. Raises a RuntimeError if no root is found,
+            as sp.newton does. The fprime and fprime2 keywords of sp.newton are accepted
+            but ignored, as the derivative is compiled in.
+    """
+
+    from numba import njit
 
-def _next_root_mp(func, x_loc, y_loc, step_size, points,
-                 solver='halley', tol=1e-15):
+    if fprime is None:
+        @njit
+        def func_der(y_loc, func_val, arguments):
+            return (func(y_loc + step, *arguments) - func_val) / step
+    else:
+        @njit
+        def func_der(y_loc, func_val, arguments):
+            return fprime(y_loc, *arguments)
+
+    @njit
+    def _newton(arguments, y_loc, maxiter):
+        for _ in range(maxiter):
+            func_val = func(y_loc, *arguments)
+            func_val_der = func_der(y_loc, func_val, arguments)
+            if func_val_der == 0:
+                raise RuntimeError('Derivative was zero.')
+            y_step = func_val / func_val_der
+            y_loc -= y_step
+            if np.abs(y_step) < tol:
+                return y_loc
+        raise RuntimeError('Failed to converge.')
+
+    def newton(arguments, x0, fprime=None, fprime2=None, maxiter=50):
+        return _newton(arguments, complex(x0), maxiter)
+
+    return newton
+
+def _next_root_mp(func, x_loc, y_loc, step_size, pts_x, pts_y, count,
+                  solver='halley', tol=1e-15, prec=100):
     """
     Docstring here.
     """
@@ -621,40 +1304,72 @@ def _next_root_mp(func, x_loc, y_loc, step_size, points,
     jump_limit = 0.1
     maxsteps = 500
 
-    try:
+    if count >= 3:
         grad = (
-            (points[-1, 1] - points[-2, 1]) +
-            (points[-1, 1] - 2*points[-2, 1] + points[-3, 1])) * \
-            np.abs(step_size/(points[-1, 0] - points[-2, 0])
+            (pts_y[count-1] - pts_y[count-2]) +
+            (pts_y[count-1] - 2*pts_y[count-2] + pts_y[count-3])) * \
+            np.abs(step_size/(pts_x[count-1] - pts_x[count-2])
                   )
-        root_mp = mp.findroot(func, points[-1, 1] + grad, solver, tol)
-        root = float(mp.re(root_mp)) + 1j * float(mp.im(root_mp))
-        if np.abs(root-points[-1, 1]) < 0.1:
-            points = np.vstack([points, [x_loc, root]])
+        root = _findroot_mp(func, pts_y[count-1] + grad, solver, tol, maxsteps, prec)
+        if np.abs(root-pts_y[count-1]) < 0.1:
+            pts_x, pts_y, count = _append_point(pts_x, pts_y, count, x_loc, root)
         else:
             raise ValueError('Jump of {:.5f} at x = {:.5f}, y = {:.5f}'.format(
-                np.abs(root-points[-1, 1]), points[-1, 0], points[-1, 1]+grad))
+                np.abs(root-pts_y[count-1]), pts_x[count-1], pts_y[count-1]+grad))
         x_error = None
 
-    except IndexError:
-        if points.all() == 0:
-            root_mp = mp.findroot(func, y_loc, solver, tol, maxsteps)
-            root = float(mp.re(root_mp)) + 1j*float(mp.im(root_mp))
-            points[0,] = x_loc, root
-        elif points.shape == (1, 2):
-            root_mp = mp.findroot(func, points[-1, 1], solver, tol, maxsteps)
-            root = float(mp.re(root_mp)) + 1j*float(mp.im(root_mp))
-            points = np.vstack([points, [x_loc, root]])
-        elif points.shape == (2, 2):
-            grad = (points[-1, 1] - points[-2, 1]) *\
-                    np.abs(step_size/(points[-1, 0] - points[-2, 0]))
-            root_mp = mp.findroot(func, points[-1, 1] + grad, solver, tol, maxsteps)
-            root = float(mp.re(root_mp)) + 1j*float(mp.im(root_mp))
-            if np.abs(root - points[-1, 1]) < jump_limit:
-                points = np.vstack([points, [x_loc, root]])
+    else:
+        if count == 0:
+            root = _findroot_mp(func, y_loc, solver, tol, maxsteps, prec)
+            pts_x, pts_y, count = _append_point(pts_x, pts_y, count, x_loc, root)
+        elif count == 1:
+            root = _findroot_mp(func, pts_y[count-1], solver, tol, maxsteps, prec)
+            pts_x, pts_y, count = _append_point(pts_x, pts_y, count, x_loc, root)
+        elif count == 2:
+            grad = (pts_y[count-1] - pts_y[count-2]) *\
+                    np.abs(step_size/(pts_x[count-1] - pts_x[count-2]))
+            root = _findroot_mp(func, pts_y[count-1] + grad, solver, tol, maxsteps, prec)
+            if np.abs(root - pts_y[count-1]) < jump_limit:
+                pts_x, pts_y, count = _append_point(pts_x, pts_y, count, x_loc, root)
             else:
                 raise ValueError('Jump of {:.5f} at x = {:.5f}, y = {:.5f}'.format(
-                    np.abs(root-points[-1, 1]), points[-1, 0], points[-1, 1]+grad))
+                    np.abs(root-pts_y[count-1]), pts_x[count-1], pts_y[count-1]+grad))
         x_error = None
 
-    return points, np.abs(step_size), x_error, x_loc
+    return pts_x, pts_y, count, np.abs(step_size), x_error, x_loc
+
+def _findroot_mp(func, y_loc, solver, tol, maxsteps, prec):
+    """
+    Finds a root of func near y_loc using mp.findroot, working at a precision of prec bits.
+
+    mpmath carries out its arithmetic with gmpy2 (GMP/MPFR) when it is installed, which is
+    considerably faster than its pure Python backend at the same precision.
+
+    Used in _next_root_mp.
+
+    Parameters
+    ----------
+        func: function
+            A function of one variable, which accepts mpmath numbers.
+        y_loc: float or complex
+            The starting point.
+        solver: string
+            Any solver supported by mp.findroot.
+        tol: float
+            The tolerance passed to mp.findroot.
+        maxsteps: int
+            The maximum number of steps of the solver.
+        prec: int
+            The working precision in bits.
+
+    Returns
+    -------
+        root: complex
+            The root found, as a double precision complex number.
+    """
+
+    with mp.workprec(prec):
+        root_mp = mp.findroot(func, mp.mpmathify(y_loc), solver=solver, tol=tol,
+                              maxsteps=maxsteps)
+
+    return complex(root_mp)